@@ -1,11 +1,16 @@
 # Copyright Modal Labs 2022
+from modal_utils.async_utils import use_uvloop_if_available
+
 from ._traceback import setup_rich_traceback
 from .cli.entry_point import entrypoint_cli
+from .config import config
 
 
 def main():
     # Setup rich tracebacks, but only on user's end, when using the Modal CLI.
     setup_rich_traceback()
+    if config.get("uvloop"):
+        use_uvloop_if_available()
     entrypoint_cli()
 
 
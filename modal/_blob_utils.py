@@ -10,14 +10,14 @@ from pathlib import Path
 from typing import AsyncIterator, BinaryIO, List, Optional, Union
 from urllib.parse import urlparse
 
-from aiohttp import BytesIOPayload
+from aiohttp import BytesIOPayload, ClientSession
 from aiohttp.abc import AbstractStreamWriter
 
 from modal.exception import ExecutionError
 from modal_proto import api_pb2
-from modal_utils.async_utils import retry
+from modal_utils.async_utils import on_shutdown, retry
 from modal_utils.grpc_utils import retry_transient_errors
-from modal_utils.hash_utils import UploadHashes, get_sha256_hex, get_upload_hashes
+from modal_utils.hash_utils import UploadHashes, get_upload_hashes, get_upload_hashes_and_size
 from modal_utils.http_utils import http_client_with_tls
 from modal_utils.logger import logger
 
@@ -32,6 +32,38 @@ LARGE_FILE_LIMIT = 4 * 1024 * 1024  # 4 MiB
 BLOB_MAX_PARALLELISM = 10
 
 
+_http_client: Optional[ClientSession] = None
+_http_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _get_http_client() -> ClientSession:
+    """Returns an HTTP client session shared by all blob transfers on the running event loop.
+
+    Reusing the session lets transfers share pooled keep-alive connections, rather than
+    setting up a new TLS connection for each request.
+    """
+    global _http_client, _http_client_loop
+    loop = asyncio.get_running_loop()
+    if _http_client is None or _http_client.closed or _http_client_loop is not loop:
+        _http_client = http_client_with_tls(timeout=None)
+        _http_client_loop = loop
+        on_shutdown(_http_client.close())
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """Closes the shared HTTP client session, along with its pooled connections.
+
+    Used before a container is checkpointed, so that no open sockets are captured in the snapshot.
+    A new session is created by the next blob transfer.
+    """
+    global _http_client, _http_client_loop
+    if _http_client is not None:
+        await _http_client.close()
+    _http_client = None
+    _http_client_loop = None
+
+
 class BytesIOSegmentPayload(BytesIOPayload):
     """Modified bytes payload for concurrent sends of chunks from the same file
 
@@ -86,15 +118,20 @@ class BytesIOSegmentPayload(BytesIOPayload):
     async def write(self, writer: AbstractStreamWriter):
         loop = asyncio.get_event_loop()
 
+        def read_at(offset: int, num_bytes: int) -> bytes:
+            # seek, read and restore the position in one executor call, so the event loop never blocks on file io
+            pos = self._value.tell()
+            self._value.seek(offset)
+            chunk = self._value.read(num_bytes)
+            self._value.seek(pos)
+            return chunk
+
         async def safe_read():
             # concurrency safe reading from same file object
             async with self.read_lock:
-                pos = self._value.tell()
                 read_start = self.initial_seek_pos + self.segment_start + self.num_bytes_read
-                self._value.seek(read_start)
                 num_bytes = min(self.chunk_size, self.remaining_bytes())
-                chunk = await loop.run_in_executor(None, self._value.read, num_bytes)
-                self._value.seek(pos)
+                chunk = await loop.run_in_executor(None, read_at, read_start, num_bytes)
 
             await loop.run_in_executor(None, self._md5_checksum.update, chunk)
             self.num_bytes_read += len(chunk)
@@ -120,47 +157,45 @@ async def _upload_to_s3_url(
 ) -> str:
     """Returns etag of s3 object which is a md5 hex checksum of the uploaded content"""
     with payload.reset_on_error():  # ensure retries read the same data
-        async with http_client_with_tls(timeout=None) as session:
-            headers = {}
-            if content_md5_b64 and use_md5(upload_url):
-                headers["Content-MD5"] = content_md5_b64
-            if content_type:
-                headers["Content-Type"] = content_type
-
-            async with session.put(
-                upload_url,
-                data=payload,
-                headers=headers,
-                skip_auto_headers=["content-type"] if content_type is None else [],
-            ) as resp:
-                # S3 signal to slow down request rate.
-                if resp.status == 503:
-                    logger.warning("Received SlowDown signal from S3, sleeping for 1 second before retrying.")
-                    await asyncio.sleep(1)
-
-                if resp.status != 200:
-                    try:
-                        text = await resp.text()
-                    except Exception:
-                        text = "<no body>"
-                    raise ExecutionError(f"Put to url {upload_url} failed with status {resp.status}: {text}")
-
-                # client side ETag checksum verification
-                # the s3 ETag of a single part upload is a quoted md5 hex of the uploaded content
-                etag = resp.headers["ETag"].strip()
-                if etag.startswith(("W/", "w/")):  # see https://www.rfc-editor.org/rfc/rfc7232#section-2.3
-                    etag = etag[2:]
-                if etag[0] == '"' and etag[-1] == '"':
-                    etag = etag[1:-1]
-                remote_md5 = etag
-
-                local_md5_hex = payload.md5_checksum().hexdigest()
-                if local_md5_hex != remote_md5:
-                    raise ExecutionError(
-                        f"Local data and remote data checksum mismatch ({local_md5_hex} vs {remote_md5})"
-                    )
-
-                return remote_md5
+        session = _get_http_client()
+        headers = {}
+        if content_md5_b64 and use_md5(upload_url):
+            headers["Content-MD5"] = content_md5_b64
+        if content_type:
+            headers["Content-Type"] = content_type
+
+        async with session.put(
+            upload_url,
+            data=payload,
+            headers=headers,
+            skip_auto_headers=["content-type"] if content_type is None else [],
+        ) as resp:
+            # S3 signal to slow down request rate.
+            if resp.status == 503:
+                logger.warning("Received SlowDown signal from S3, sleeping for 1 second before retrying.")
+                await asyncio.sleep(1)
+
+            if resp.status != 200:
+                try:
+                    text = await resp.text()
+                except Exception:
+                    text = "<no body>"
+                raise ExecutionError(f"Put to url {upload_url} failed with status {resp.status}: {text}")
+
+            # client side ETag checksum verification
+            # the s3 ETag of a single part upload is a quoted md5 hex of the uploaded content
+            etag = resp.headers["ETag"].strip()
+            if etag.startswith(("W/", "w/")):  # see https://www.rfc-editor.org/rfc/rfc7232#section-2.3
+                etag = etag[2:]
+            if etag[0] == '"' and etag[-1] == '"':
+                etag = etag[1:-1]
+            remote_md5 = etag
+
+            local_md5_hex = payload.md5_checksum().hexdigest()
+            if local_md5_hex != remote_md5:
+                raise ExecutionError(f"Local data and remote data checksum mismatch ({local_md5_hex} vs {remote_md5})")
+
+            return remote_md5
 
 
 async def perform_multipart_upload(
@@ -197,10 +232,10 @@ async def perform_multipart_upload(
     bin_hash_parts = [bytes.fromhex(etag) for etag in part_etags]
 
     expected_multipart_etag = hashlib.md5(b"".join(bin_hash_parts)).hexdigest() + f"-{len(part_etags)}"
-    async with http_client_with_tls(timeout=None) as session:
-        resp = await session.post(
-            completion_url, data=completion_body.encode("ascii"), skip_auto_headers=["content-type"]
-        )
+    session = _get_http_client()
+    async with session.post(
+        completion_url, data=completion_body.encode("ascii"), skip_auto_headers=["content-type"]
+    ) as resp:
         if resp.status != 200:
             try:
                 msg = await resp.text()
@@ -268,24 +303,25 @@ async def blob_upload(payload: bytes, stub) -> str:
     return await _blob_upload(upload_hashes, payload, stub)
 
 
-async def blob_upload_file(file_obj: BinaryIO, stub) -> str:
-    upload_hashes = get_upload_hashes(file_obj)
+async def blob_upload_file(file_obj: BinaryIO, stub, upload_hashes: Optional[UploadHashes] = None) -> str:
+    if upload_hashes is None:
+        upload_hashes = get_upload_hashes(file_obj)
     return await _blob_upload(upload_hashes, file_obj, stub)
 
 
 @retry(n_attempts=5, base_delay=0.1, timeout=None)
 async def _download_from_url(download_url) -> bytes:
-    async with http_client_with_tls(timeout=None) as session:
-        async with session.get(download_url) as resp:
-            # S3 signal to slow down request rate.
-            if resp.status == 503:
-                logger.warning("Received SlowDown signal from S3, sleeping for 1 second before retrying.")
-                await asyncio.sleep(1)
+    session = _get_http_client()
+    async with session.get(download_url) as resp:
+        # S3 signal to slow down request rate.
+        if resp.status == 503:
+            logger.warning("Received SlowDown signal from S3, sleeping for 1 second before retrying.")
+            await asyncio.sleep(1)
 
-            if resp.status != 200:
-                text = await resp.text()
-                raise ExecutionError(f"Get from url failed with status {resp.status}: {text}")
-            return await resp.read()
+        if resp.status != 200:
+            text = await resp.text()
+            raise ExecutionError(f"Get from url failed with status {resp.status}: {text}")
+        return await resp.read()
 
 
 async def blob_download(blob_id, stub) -> bytes:
@@ -300,56 +336,77 @@ async def blob_iter(blob_id, stub) -> AsyncIterator[bytes]:
     req = api_pb2.BlobGetRequest(blob_id=blob_id)
     resp = await retry_transient_errors(stub.BlobGet, req)
     download_url = resp.download_url
-    async with http_client_with_tls(timeout=None) as session:
-        async with session.get(download_url) as resp:
-            # S3 signal to slow down request rate.
-            if resp.status == 503:
-                logger.warning("Received SlowDown signal from S3, sleeping for 1 second before retrying.")
-                await asyncio.sleep(1)
+    session = _get_http_client()
+    async with session.get(download_url) as resp:
+        # S3 signal to slow down request rate.
+        if resp.status == 503:
+            logger.warning("Received SlowDown signal from S3, sleeping for 1 second before retrying.")
+            await asyncio.sleep(1)
 
-            if resp.status != 200:
-                text = await resp.text()
-                raise ExecutionError(f"Get from url failed with status {resp.status}: {text}")
+        if resp.status != 200:
+            text = await resp.text()
+            raise ExecutionError(f"Get from url failed with status {resp.status}: {text}")
 
-            async for chunk in resp.content.iter_any():
-                yield chunk
+        async for chunk in resp.content.iter_any():
+            yield chunk
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(frozen=True)
 class FileUploadSpec:
+    # Mounts can have many thousands of these, so avoid a per-instance __dict__
+    # (dataclass(slots=True) requires Python 3.10)
+    __slots__ = ("filename", "mount_filename", "use_blob", "content", "sha256_hex", "upload_hashes", "mode", "size")
+
     filename: Path
     mount_filename: str
 
     use_blob: bool
     content: Optional[bytes]  # typically None if using blob, required otherwise
     sha256_hex: str
+    upload_hashes: Optional[UploadHashes]  # only computed if using blob
     mode: int  # file permission bits (last 12 bits of st_mode)
     size: int
 
+    # Without a __dict__, copy and pickle restore slots with setattr, which frozen dataclasses reject
+    def __getstate__(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __setstate__(self, state):
+        for name, value in zip(self.__slots__, state):
+            object.__setattr__(self, name, value)
+
 
 def get_file_upload_spec(filename: Path, mount_filename: str) -> FileUploadSpec:
     # Somewhat CPU intensive, so we run it in a thread/process
-    stat = os.stat(filename)
-    if stat.st_size >= LARGE_FILE_LIMIT:
-        use_blob = True
-        content = None
-        with open(filename, "rb") as fp:
-            sha256_hex = get_sha256_hex(fp)
-    else:
-        use_blob = False
-        with open(filename, "rb") as fp:
-            content = fp.read()
-        sha256_hex = get_sha256_hex(content)
+    with open(filename, "rb") as fp:
+        # Stat the open file rather than the path, so the mode can't come from a different file than the contents
+        stat = os.fstat(fp.fileno())
+        # Most files are small, so probe by reading up to the limit: if we hit EOF first we're done,
+        # and the decision is based on what was actually read rather than a possibly stale size.
+        content: Optional[bytes] = fp.read(LARGE_FILE_LIMIT)
+        if len(content) < LARGE_FILE_LIMIT:
+            use_blob = False
+            size = len(content)
+            upload_hashes = None
+            sha256_hex = hashlib.sha256(content).hexdigest()
+        else:
+            use_blob = True
+            # Keep hashing from where the probe left off, computing the md5 needed by the blob upload in
+            # the same pass. The size is what was hashed, so it matches the hashes even if the file changes.
+            upload_hashes, size = get_upload_hashes_and_size(content, fp)
+            content = None
+            sha256_hex = upload_hashes.sha256_hex()
     return FileUploadSpec(
         filename,
         mount_filename,
         use_blob=use_blob,
         content=content,
         sha256_hex=sha256_hex,
+        upload_hashes=upload_hashes,
         # Python appears to give files 0o666 bits on Windows (equal for user, group, and global),
         # so we mask those out to 0o755 for compatibility with POSIX-based permissions.
         mode=stat.st_mode & (0o7777 if platform.system() != "Windows" else 0o7755),
-        size=stat.st_size,
+        size=size,
     )
 
 
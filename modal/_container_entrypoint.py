@@ -19,6 +19,7 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, AsyncGenerator, AsyncIterator, Callable, Dict, Optional, Type
 
+from google.protobuf.internal import api_implementation
 from grpclib import GRPCError, Status
 from grpclib.exceptions import StreamTerminatedError
 
@@ -33,7 +34,7 @@ from modal_utils.async_utils import (
 from modal_utils.grpc_utils import RETRYABLE_GRPC_STATUS_CODES, retry_transient_errors, unary_stream
 
 from ._asgi import asgi_app_wrapper, webhook_asgi_app, wsgi_app_wrapper
-from ._blob_utils import MAX_OBJECT_SIZE_BYTES, blob_download, blob_upload
+from ._blob_utils import MAX_OBJECT_SIZE_BYTES, blob_download, blob_upload, close_http_client
 from ._function_utils import LocalFunctionError, is_async as get_is_async, is_global_function
 from ._proxy_tunnel import proxy_tunnel
 from ._pty import exec_cmd, run_in_pty
@@ -276,7 +277,9 @@ class _FunctionIOManager:
 
         try:
             async for input_id, function_call_id, input_pb in self._generate_inputs():
-                args, kwargs = self.deserialize(input_pb.args) if input_pb.args else ((), {})
+                # Read the field once: protobuf returns a fresh copy of bytes fields on every access
+                serialized_args = input_pb.args
+                args, kwargs = self.deserialize(serialized_args) if serialized_args else ((), {})
                 self.current_input_id, self.current_input_started_at = (input_id, time.time())
                 yield input_id, function_call_id, args, kwargs
                 self.current_input_id, self.current_input_started_at = (None, None)
@@ -441,8 +444,9 @@ class _FunctionIOManager:
 
         self._waiting_for_checkpoint = True
         await self._client._close()
+        await close_http_client()
 
-        logger.debug("checkpointing request sent and connection closed")
+        logger.debug("checkpointing request sent and connections closed")
 
         # Busy-wait for restore. `/opt/modal/restore-state.json` is created
         # by the worker process with updates to the container config.
@@ -831,6 +835,14 @@ def main(container_args: api_pb2.ContainerArguments, client: Client):
 if __name__ == "__main__":
     logger.debug("Container: starting")
 
+    if api_implementation.Type() == "python":
+        # Every input and output goes through protobuf (de)serialization, which is orders of magnitude
+        # slower without the C++/upb extension.
+        logger.warning(
+            "Using the pure-Python protobuf implementation, which is much slower. "
+            "Install a protobuf wheel with the C extension (and unset PROTOCOL_BUFFERS_PYTHON_IMPLEMENTATION)."
+        )
+
     container_args = api_pb2.ContainerArguments()
     container_args.ParseFromString(base64.b64decode(sys.argv[1]))
 
@@ -139,6 +139,10 @@ class Resolver:
                 )
         return [fut.result() for fut in self._local_uuid_to_future.values()]
 
+    def cancel_pending(self):
+        for fut in self._local_uuid_to_future.values():
+            fut.cancel()
+
     @contextlib.contextmanager
     def display(self):
         from ._output import step_completed
@@ -1,4 +1,5 @@
 # Copyright Modal Labs 2022
+import asyncio
 from datetime import date
 from typing import TYPE_CHECKING, Any, Dict, List, Optional, TypeVar
 
@@ -92,18 +93,32 @@ class _LocalApp:
             # functions have ids assigned to them when the function is serialized.
             # Note: when handles/objs are merged, all objects will need to get ids pre-assigned
             # like this in order to be referrable within serialized functions
+            # Note: preload only currently implemented for Functions, returns None otherwise
+            # this is to ensure that directly referenced functions from the global scope has
+            # ids associated with them when they are serialized into other functions
+            preload_tasks = [
+                asyncio.create_task(resolver.preload(obj, tag_to_object_id.get(tag)))
+                for tag, obj in indexed_objects.items()
+            ]
+            try:
+                await asyncio.gather(*preload_tasks)
+                for tag, obj in indexed_objects.items():
+                    if obj.object_id is not None:
+                        tag_to_object_id[tag] = obj.object_id
+
+                # Load all objects concurrently, so the total time is bounded by the slowest dependency chain
+                # rather than the sum of all round trips. The resolver dedupes concurrent loads of the same object.
+                await asyncio.gather(
+                    *(resolver.load(obj, tag_to_object_id.get(tag)) for tag, obj in indexed_objects.items())
+                )
+            except BaseException:
+                # gather() leaves the other awaitables running when one of them fails. Cancel them, so that
+                # a failed object doesn't leave its siblings issuing RPCs and streaming logs in the background.
+                for task in preload_tasks:
+                    task.cancel()
+                resolver.cancel_pending()
+                raise
             for tag, obj in indexed_objects.items():
-                existing_object_id = tag_to_object_id.get(tag)
-                # Note: preload only currently implemented for Functions, returns None otherwise
-                # this is to ensure that directly referenced functions from the global scope has
-                # ids associated with them when they are serialized into other functions
-                await resolver.preload(obj, existing_object_id)
-                if obj.object_id is not None:
-                    tag_to_object_id[tag] = obj.object_id
-
-            for tag, obj in indexed_objects.items():
-                existing_object_id = tag_to_object_id.get(tag)
-                await resolver.load(obj, existing_object_id)
                 self._tag_to_object_id[tag] = obj.object_id
 
         # Create the app (and send a list of all tagged obs)
@@ -154,8 +169,10 @@ class _LocalApp:
         )
 
     def __getattr__(self, tag: str) -> _Object:
-        if tag.startswith("__"):
-            raise AttributeError(f"No such attribute `{tag}`")  # Dumb workaround for doc thing
+        if tag.startswith("_"):
+            # Private and dunder lookups must raise AttributeError, so that hasattr() and introspection
+            # (docs, IPython display hooks, copy, pickle) keep working
+            raise AttributeError(f"No such attribute `{tag}`")
         deprecation_error(date(2023, 8, 10), "`app.obj` is no longer supported. Use the stub to get objects instead.")
 
     @staticmethod
@@ -241,7 +258,7 @@ class _ContainerApp:
     _associated_stub: Optional[Any]  # TODO(erikbern): type
     _environment_name: Optional[str]
     _tag_to_object_id: Dict[str, str]
-    _object_handle_metadata: Dict[str, Optional[Message]]
+    _objects: Dict[str, api_pb2.Object]
     _stub_name: Optional[str]
 
     def __init__(self):
@@ -251,7 +268,7 @@ class _ContainerApp:
         self._stub_name = None
         self._environment_name = None
         self._tag_to_object_id = {}
-        self._object_handle_metadata = {}
+        self._objects = {}
 
     @property
     def client(self) -> Optional[_Client]:
@@ -280,7 +297,7 @@ class _ContainerApp:
             for tag, object_id in self._tag_to_object_id.items():
                 obj = stub_objects.get(tag)
                 if obj is not None:
-                    handle_metadata = self._object_handle_metadata[object_id]
+                    handle_metadata = self._get_handle_metadata(object_id)
                     obj._hydrate(object_id, self._client, handle_metadata)
 
     def __getitem__(self, tag: str) -> _Object:
@@ -292,23 +309,29 @@ class _ContainerApp:
         )
 
     def __getattr__(self, tag: str) -> _Object:
-        if tag.startswith("__"):
-            raise AttributeError(f"No such attribute `{tag}`")  # Dumb workaround for doc thing
+        if tag.startswith("_"):
+            # Private and dunder lookups must raise AttributeError, so that hasattr() and introspection
+            # (docs, IPython display hooks, copy, pickle) keep working
+            raise AttributeError(f"No such attribute `{tag}`")
         deprecation_error(date(2023, 8, 10), "`app.obj` is no longer supported. Use the stub to get objects instead.")
 
+    def _get_handle_metadata(self, object_id: str) -> Optional[Message]:
+        # Resolved on demand, since most objects of the app are never used by a given container
+        return get_proto_oneof(self._objects[object_id], "handle_metadata_oneof")
+
     def _has_object(self, tag: str) -> bool:
         return tag in self._tag_to_object_id
 
     def _hydrate_object(self, obj, tag: str):
         object_id: str = self._tag_to_object_id[tag]
-        metadata: Message = self._object_handle_metadata[object_id]
+        metadata: Message = self._get_handle_metadata(object_id)
         obj._hydrate(object_id, self._client, metadata)
 
     def _get_pty(self) -> _Object:
         # TOOD(erikbern): This method has zero tests. It's used in _container_entrypoint
         # Let's try to clean this up ASAP
         object_id = self._tag_to_object_id["_pty_input_stream"]
-        metadata = self._object_handle_metadata[object_id]
+        metadata = self._get_handle_metadata(object_id)
         return _Object._new_hydrated(object_id, self._client, metadata)
 
     def hydrate_function_deps(self, function: _Function, dep_object_ids: List[str]):
@@ -319,7 +342,7 @@ class _ContainerApp:
                 f" but container got {len(dep_object_ids)} object ids."
             )
         for object_id, obj in zip(dep_object_ids, function_deps):
-            metadata: Message = self._object_handle_metadata[object_id]
+            metadata: Message = self._get_handle_metadata(object_id)
             obj._hydrate(object_id, self._client, metadata)
 
     async def init(self, client: _Client, app_id: str, stub_name: str = "", environment_name: str = ""):
@@ -331,15 +354,22 @@ class _ContainerApp:
         self._app_id = app_id
         self._stub_name = stub_name
         self._environment_name = environment_name
-        self._tag_to_object_id = {}
-        self._object_handle_metadata = {}
         req = api_pb2.AppGetObjectsRequest(app_id=app_id, include_unindexed=True)
         resp = await retry_transient_errors(client.stub.AppGetObjects, req)
+
+        # This is on the container startup path, so read each field once into a local to save repeated
+        # descriptor lookups. Handle metadata is only extracted for objects that actually get hydrated.
+        tag_to_object_id: Dict[str, str] = {}
+        objects: Dict[str, api_pb2.Object] = {}
         for item in resp.items:
-            handle_metadata: Optional[Message] = get_proto_oneof(item.object, "handle_metadata_oneof")
-            self._object_handle_metadata[item.object.object_id] = handle_metadata
-            if item.tag:
-                self._tag_to_object_id[item.tag] = item.object.object_id
+            obj = item.object
+            object_id = obj.object_id
+            objects[object_id] = obj
+            tag = item.tag
+            if tag:
+                tag_to_object_id[tag] = object_id
+        self._tag_to_object_id = tag_to_object_id
+        self._objects = objects
 
     async def spawn_sandbox(
         self,
@@ -39,10 +39,13 @@ def display_selection(choices: List[str], active: str, json: bool):
     if json:
         json_data = [{"name": choice, "active": choice == active} for choice in choices]
         console.print(JSON.from_data(json_data))
-    else:
-        for choice in choices:
-            text = Text(f"{choice} [active]", style="green") if active == choice else Text(choice, style="dim")
-            console.print(text)
+    elif choices:
+        # Render all rows in a single print call, rather than one render and write per row
+        texts = [
+            Text(f"{choice} [active]", style="green") if active == choice else Text(choice, style="dim")
+            for choice in choices
+        ]
+        console.print(*texts, sep="\n")
 
 
 ENV_OPTION_HELP = """Environment to interact with.
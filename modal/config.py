@@ -59,6 +59,10 @@ Other possible configuration options are:
 * ``server_url`` (in the .toml file) / ``MODAL_SERVER_URL`` (as an env var).
   Defaults to ``https://api.modal.com``.
   Not typically meant to be used.
+* ``uvloop`` (in the .toml file) / ``MODAL_UVLOOP`` (as an env var).
+  Defaults to False.
+  Set this to True to make the Modal CLI run its event loops on uvloop, if it's installed.
+  This also applies to async local entrypoints run by ``modal run``.
 
 Meta-configuration
 ------------------
@@ -158,6 +162,8 @@ _SETTINGS = {
     "default_cloud": _Setting(None, transform=lambda x: x if x else None),
     "worker_id": _Setting(),  # For internal debugging use.
     "restore_state_path": _Setting("/opt/modal/restore-state.json"),
+    # Values from the .toml file are already bools, and only env vars need to be parsed
+    "uvloop": _Setting(False, transform=lambda x: x if isinstance(x, bool) else x not in ("", "0", "false", "False")),
 }
 
 
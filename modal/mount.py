@@ -324,6 +324,7 @@ class _Mount(_StatefulObject, type_prefix="mo"):
         n_concurrent_uploads = 16
 
         n_files = 0
+        seen_hashes: set[str] = set()
         uploaded_hashes: set[str] = set()
         total_bytes = 0
         message_label = _Mount._description(entries)
@@ -342,13 +343,17 @@ class _Mount(_StatefulObject, type_prefix="mo"):
                 mode=file_spec.mode,
             )
 
-            if file_spec.sha256_hex in uploaded_hashes:
+            n_files += 1
+
+            # Files with identical contents only need to be uploaded once. Mark the hash as seen before the
+            # first await, so that concurrent uploads of duplicate files don't race past this check.
+            if file_spec.sha256_hex in seen_hashes:
                 return mount_file
+            seen_hashes.add(file_spec.sha256_hex)
 
             request = api_pb2.MountPutFileRequest(sha256_hex=file_spec.sha256_hex)
             response = await retry_transient_errors(resolver.client.stub.MountPutFile, request, base_delay=1)
 
-            n_files += 1
             if response.exists:
                 return mount_file
 
@@ -358,7 +363,7 @@ class _Mount(_StatefulObject, type_prefix="mo"):
             if file_spec.use_blob:
                 logger.debug(f"Creating blob file for {file_spec.filename} ({file_spec.size} bytes)")
                 with open(file_spec.filename, "rb") as fp:
-                    blob_id = await blob_upload_file(fp, resolver.client.stub)
+                    blob_id = await blob_upload_file(fp, resolver.client.stub, file_spec.upload_hashes)
                 logger.debug(f"Uploading blob file {file_spec.filename} as {remote_filename}")
                 request2 = api_pb2.MountPutFileRequest(data_blob_id=blob_id, sha256_hex=file_spec.sha256_hex)
             else:
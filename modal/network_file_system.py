@@ -11,7 +11,7 @@ from modal._location import parse_cloud_provider
 from modal_proto import api_pb2
 from modal_utils.async_utils import ConcurrencyPool, synchronize_api
 from modal_utils.grpc_utils import retry_transient_errors, unary_stream
-from modal_utils.hash_utils import get_sha256_hex
+from modal_utils.hash_utils import get_upload_hashes
 
 from ._blob_utils import LARGE_FILE_LIMIT, blob_iter, blob_upload_file
 from ._resolver import Resolver
@@ -152,17 +152,18 @@ class _NetworkFileSystem(_StatefulObject, type_prefix="sv"):
         If remote_path ends with `/` it's assumed to be a directory and the
         file will be uploaded with its current name to that directory.
         """
-        sha_hash = get_sha256_hex(fp)
         fp.seek(0, os.SEEK_END)
         data_size = fp.tell()
         fp.seek(0)
         if data_size > LARGE_FILE_LIMIT:
-            blob_id = await blob_upload_file(fp, self._client.stub)
+            # md5 and sha256 are computed in a single pass, and reused by the blob upload
+            upload_hashes = get_upload_hashes(fp)
+            blob_id = await blob_upload_file(fp, self._client.stub, upload_hashes)
             req = api_pb2.SharedVolumePutFileRequest(
                 shared_volume_id=self.object_id,
                 path=remote_path,
                 data_blob_id=blob_id,
-                sha256_hex=sha_hash,
+                sha256_hex=upload_hashes.sha256_hex(),
                 resumable=True,
             )
         else:
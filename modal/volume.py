@@ -9,7 +9,7 @@ from grpclib import GRPCError, Status
 
 import modal.exception
 from modal_proto import api_pb2
-from modal_utils.async_utils import ConcurrencyPool, asyncnullcontext, synchronize_api
+from modal_utils.async_utils import ConcurrencyPool, asyncify, asyncnullcontext, synchronize_api
 from modal_utils.grpc_utils import retry_transient_errors, unary_stream
 
 from ._blob_utils import blob_iter, blob_upload_file, get_file_upload_spec
@@ -309,7 +309,7 @@ class _Volume(_StatefulObject, type_prefix="vo"):
         else:
             remote_path = PurePosixPath(remote_path).as_posix()
 
-        file_spec = get_file_upload_spec(local_path, str(remote_path))
+        file_spec = await asyncify(get_file_upload_spec)(local_path, str(remote_path))
         remote_filename = file_spec.mount_filename
 
         request = api_pb2.MountPutFileRequest(sha256_hex=file_spec.sha256_hex)
@@ -319,7 +319,7 @@ class _Volume(_StatefulObject, type_prefix="vo"):
             if file_spec.use_blob:
                 logger.debug(f"Creating blob file for {file_spec.filename} ({file_spec.size} bytes)")
                 with open(file_spec.filename, "rb") as fp:
-                    blob_id = await blob_upload_file(fp, self._client.stub)
+                    blob_id = await blob_upload_file(fp, self._client.stub, file_spec.upload_hashes)
                 logger.debug(f"Uploading blob file {file_spec.filename} as {remote_filename}")
                 request2 = api_pb2.MountPutFileRequest(data_blob_id=blob_id, sha256_hex=file_spec.sha256_hex)
             else:
@@ -32,6 +32,23 @@ def synchronize_api(obj, target_module=None):
     return synchronizer.create_blocking(obj, blocking_name, target_module=target_module)
 
 
+def use_uvloop_if_available():
+    """Make event loops created from now on use uvloop, if it's installed.
+
+    Needs to run before the synchronizer starts its loop. uvloop doesn't support Windows.
+    The policy is process-wide, so it also applies to any user code run in the same process
+    (e.g. async local entrypoints), which is why callers only use it when opted in.
+    """
+    if sys.platform == "win32":
+        return
+    try:
+        import uvloop
+    except ImportError:
+        return
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    logger.debug("Using uvloop event loop")
+
+
 def retry(direct_fn=None, *, n_attempts=3, base_delay=0, delay_factor=2, timeout=90):
     """Decorator that calls an async function multiple times, with a given timeout.
 
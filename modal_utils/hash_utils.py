@@ -2,17 +2,38 @@
 import base64
 import dataclasses
 import hashlib
-from typing import IO, Union
+from typing import IO, Tuple, Union
 
 HASH_CHUNK_SIZE = 4096
 
+# Buffer size for binary file objects supporting readinto()
+HASH_READINTO_BUFFER_SIZE = 1024 * 1024  # 1 MiB
 
-def _update(hashers, data: Union[bytes, IO[bytes]]):
+
+def _update(hashers, data: Union[bytes, IO[bytes]]) -> int:
+    """Feed `data` to all `hashers`, returning the number of bytes hashed."""
     if isinstance(data, bytes):
         for hasher in hashers:
             hasher.update(data)
+        return len(data)
+    elif hasattr(data, "readinto"):
+        # Feed all hashers from one reusable buffer, so each chunk is read once and never copied
+        pos = data.tell()
+        size = 0
+        buf = memoryview(bytearray(HASH_READINTO_BUFFER_SIZE))
+        while 1:
+            n = data.readinto(buf)
+            if not n:
+                break
+            view = buf[:n]
+            for hasher in hashers:
+                hasher.update(view)
+            size += n
+        data.seek(pos)
+        return size
     else:
         pos = data.tell()
+        size = 0
         while 1:
             chunk = data.read(HASH_CHUNK_SIZE)
             if not isinstance(chunk, bytes):
@@ -21,7 +42,9 @@ def _update(hashers, data: Union[bytes, IO[bytes]]):
                 break
             for hasher in hashers:
                 hasher.update(chunk)
+            size += len(chunk)
         data.seek(pos)
+        return size
 
 
 def get_sha256_hex(data: Union[bytes, IO[bytes]]) -> str:
@@ -42,17 +65,35 @@ def get_md5_base64(data: Union[bytes, IO[bytes]]) -> str:
     return base64.b64encode(hasher.digest()).decode("utf-8")
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(frozen=True)
 class UploadHashes:
     md5_base64: str
     sha256_base64: str
 
+    def sha256_hex(self) -> str:
+        return base64.b64decode(self.sha256_base64).hex()
 
-def get_upload_hashes(data: Union[bytes, IO[bytes]]) -> UploadHashes:
-    md5 = hashlib.md5()
-    sha256 = hashlib.sha256()
-    _update([md5, sha256], data)
+
+def _upload_hashes(md5, sha256) -> UploadHashes:
     return UploadHashes(
         md5_base64=base64.b64encode(md5.digest()).decode("ascii"),
         sha256_base64=base64.b64encode(sha256.digest()).decode("ascii"),
     )
+
+
+def get_upload_hashes(data: Union[bytes, IO[bytes]]) -> UploadHashes:
+    md5 = hashlib.md5()
+    sha256 = hashlib.sha256()
+    _update([md5, sha256], data)
+    return _upload_hashes(md5, sha256)
+
+
+def get_upload_hashes_and_size(head: bytes, rest: IO[bytes]) -> Tuple[UploadHashes, int]:
+    """Hash `head` followed by the remainder of `rest`, returning the hashes and the total bytes hashed.
+
+    For callers that have already read the start of a file, so it doesn't need to be read again.
+    """
+    md5 = hashlib.md5(head)
+    sha256 = hashlib.sha256(head)
+    size = len(head) + _update([md5, sha256], rest)
+    return _upload_hashes(md5, sha256), size
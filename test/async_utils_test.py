@@ -4,6 +4,9 @@ import logging
 import os
 import platform
 import pytest
+import sys
+import types
+from typing import Any, List
 
 from synchronicity import Synchronizer
 
@@ -13,6 +16,7 @@ from modal_utils.async_utils import (
     TaskContext,
     queue_batch_iterator,
     retry,
+    use_uvloop_if_available,
     warn_if_generator_is_not_consumed,
 )
 
@@ -205,6 +209,39 @@ def test_exit_handler():
     assert result == "bye"
 
 
+@pytest.fixture
+def set_policy_calls(monkeypatch):
+    calls: List[Any] = []
+    monkeypatch.setattr(asyncio, "set_event_loop_policy", calls.append)
+    return calls
+
+
+def test_use_uvloop_if_available(monkeypatch, set_policy_calls):
+    fake_uvloop = types.ModuleType("uvloop")
+    fake_uvloop.EventLoopPolicy = lambda: "uvloop-policy"  # type: ignore
+    monkeypatch.setitem(sys.modules, "uvloop", fake_uvloop)
+    monkeypatch.setattr(sys, "platform", "linux")
+
+    use_uvloop_if_available()
+    assert set_policy_calls == ["uvloop-policy"]
+
+
+def test_use_uvloop_if_available_not_installed(monkeypatch, set_policy_calls):
+    monkeypatch.setitem(sys.modules, "uvloop", None)  # makes the import raise ImportError
+    monkeypatch.setattr(sys, "platform", "linux")
+
+    use_uvloop_if_available()
+    assert set_policy_calls == []
+
+
+def test_use_uvloop_if_available_windows(monkeypatch, set_policy_calls):
+    monkeypatch.setitem(sys.modules, "uvloop", types.ModuleType("uvloop"))
+    monkeypatch.setattr(sys, "platform", "win32")
+
+    use_uvloop_if_available()
+    assert set_policy_calls == []
+
+
 @pytest.mark.asyncio
 async def test_concurrency_pool():
     max_running = 0
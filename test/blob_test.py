@@ -1,9 +1,21 @@
 # Copyright Modal Labs 2022
+import asyncio
+import base64
+import copy
+import hashlib
+import pickle
 import pytest
 
-from modal._blob_utils import blob_download as _blob_download, blob_upload as _blob_upload
+from modal import _blob_utils
+from modal._blob_utils import (
+    LARGE_FILE_LIMIT,
+    blob_download as _blob_download,
+    blob_upload as _blob_upload,
+    get_file_upload_spec,
+)
 from modal.exception import ExecutionError
 from modal_utils.async_utils import synchronize_api
+from modal_utils.http_utils import http_client_with_tls
 
 blob_upload = synchronize_api(_blob_upload)
 blob_download = synchronize_api(_blob_download)
@@ -44,3 +56,121 @@ async def test_blob_multipart(servicer, blob_server, client):
     data = b"*" * 10_000_020
     blob_id = await blob_upload.aio(data, client.stub)
     assert await blob_download.aio(blob_id, client.stub) == data
+
+
+@pytest.mark.asyncio
+async def test_blob_transfers_share_http_client(servicer, blob_server, client, monkeypatch):
+    monkeypatch.setattr(_blob_utils, "_http_client", None)
+    sessions = []
+
+    def create_session(**kwargs):
+        session = http_client_with_tls(**kwargs)
+        sessions.append(session)
+        return session
+
+    monkeypatch.setattr(_blob_utils, "http_client_with_tls", create_session)
+
+    blob_id = await blob_upload.aio(b"Hello, world", client.stub)
+    assert await blob_download.aio(blob_id, client.stub) == b"Hello, world"
+    assert len(sessions) == 1
+
+
+def _shutdown_loop(loop):
+    # Cancel the on_shutdown tasks, like synchronicity does when closing its loop
+    tasks = asyncio.all_tasks(loop)
+    for task in tasks:
+        task.cancel()
+    loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+    loop.close()
+
+
+def test_http_client_per_loop(monkeypatch):
+    monkeypatch.setattr(_blob_utils, "_http_client", None)
+
+    async def get_http_client():
+        return _blob_utils._get_http_client()
+
+    loop_1 = asyncio.new_event_loop()
+    loop_2 = asyncio.new_event_loop()
+    session_1 = loop_1.run_until_complete(get_http_client())
+    assert loop_1.run_until_complete(get_http_client()) is session_1
+
+    # A different loop gets its own session, even though the first one is still open
+    session_2 = loop_2.run_until_complete(get_http_client())
+    assert session_2 is not session_1
+    assert not session_1.closed
+
+    # Sessions are closed when their loop shuts down
+    _shutdown_loop(loop_1)
+    _shutdown_loop(loop_2)
+    assert session_1.closed
+    assert session_2.closed
+
+
+def test_http_client_recreated_when_closed(monkeypatch):
+    monkeypatch.setattr(_blob_utils, "_http_client", None)
+
+    async def main():
+        session_1 = _blob_utils._get_http_client()
+        await session_1.close()
+        session_2 = _blob_utils._get_http_client()
+        assert session_2 is not session_1
+        assert not session_2.closed
+        return session_2
+
+    loop = asyncio.new_event_loop()
+    session = loop.run_until_complete(main())
+    _shutdown_loop(loop)
+    assert session.closed
+
+
+def test_close_http_client(monkeypatch):
+    monkeypatch.setattr(_blob_utils, "_http_client", None)
+
+    async def main():
+        session_1 = _blob_utils._get_http_client()
+        await _blob_utils.close_http_client()
+        assert session_1.closed
+        assert _blob_utils._http_client is None
+        assert _blob_utils._http_client_loop is None
+
+        # Closing again is a no-op, and the next transfer gets a new session
+        await _blob_utils.close_http_client()
+        session_2 = _blob_utils._get_http_client()
+        assert session_2 is not session_1
+        return session_2
+
+    loop = asyncio.new_event_loop()
+    session = loop.run_until_complete(main())
+    _shutdown_loop(loop)
+    assert session.closed
+
+
+@pytest.mark.parametrize("size", [0, 100, LARGE_FILE_LIMIT - 1, LARGE_FILE_LIMIT, LARGE_FILE_LIMIT + 3_000_001])
+def test_get_file_upload_spec(tmp_path, size):
+    data = bytes(range(256)) * (size // 256) + b"x" * (size % 256)
+    path = tmp_path / "data.bin"
+    path.write_bytes(data)
+
+    spec = get_file_upload_spec(path, "/data.bin")
+    assert spec.size == size
+    assert spec.sha256_hex == hashlib.sha256(data).hexdigest()
+    if size >= LARGE_FILE_LIMIT:
+        assert spec.use_blob
+        assert spec.content is None
+        assert spec.upload_hashes.md5_base64 == base64.b64encode(hashlib.md5(data).digest()).decode()
+    else:
+        assert not spec.use_blob
+        assert spec.content == data
+        assert spec.upload_hashes is None
+
+
+def test_file_upload_spec_copy_pickle_hash(tmp_path):
+    path = tmp_path / "data.bin"
+    path.write_bytes(b"x" * LARGE_FILE_LIMIT)
+
+    spec = get_file_upload_spec(path, "/data.bin")
+    assert spec.use_blob
+    for spec_copy in [copy.copy(spec), copy.deepcopy(spec), pickle.loads(pickle.dumps(spec))]:
+        assert spec_copy == spec
+        assert hash(spec_copy) == hash(spec)
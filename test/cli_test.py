@@ -539,3 +539,33 @@ def test_cls(servicer, set_env_client, test_dir):
 
     _run(["run", stub_file.as_posix(), "--x", "42", "--y", "1000"])
     _run(["run", f"{stub_file.as_posix()}::AParametrized.some_method", "--x", "42", "--y", "1000"])
+
+
+@pytest.mark.parametrize(
+    "env_setting,toml_setting,expected_calls",
+    [
+        (None, None, 0),
+        ("0", None, 0),
+        ("false", None, 0),
+        ("1", None, 1),
+        (None, False, 0),
+        (None, True, 1),
+        ("0", True, 0),
+    ],
+)
+def test_main_uvloop_opt_in(monkeypatch, env_setting, toml_setting, expected_calls):
+    import modal.__main__
+
+    if env_setting is None:
+        monkeypatch.delenv("MODAL_UVLOOP", raising=False)
+    else:
+        monkeypatch.setenv("MODAL_UVLOOP", env_setting)
+    if toml_setting is not None:
+        monkeypatch.setitem(modal.config._user_config, modal.config._profile, {"uvloop": toml_setting})
+    use_uvloop = mock.Mock()
+    monkeypatch.setattr(modal.__main__, "use_uvloop_if_available", use_uvloop)
+    monkeypatch.setattr(modal.__main__, "setup_rich_traceback", mock.Mock())
+    monkeypatch.setattr(modal.__main__, "entrypoint_cli", mock.Mock())
+
+    modal.__main__.main()
+    assert use_uvloop.call_count == expected_calls
@@ -6,8 +6,8 @@ from unittest import mock
 
 import modal.secret
 from modal import Dict, Stub
-from modal.app import container_app
-from modal.exception import InvalidError
+from modal.app import _LocalApp, container_app
+from modal.exception import DeprecationError, InvalidError
 from modal_proto import api_pb2
 
 from .supports.skip import skip_windows_unix_socket
@@ -53,3 +53,18 @@ def test_typechecking_not_enforced_in_container():
     with mock.patch.dict(os.environ, {"MODAL_IMAGE_ID": "im-123"}):
         importlib.reload(modal.secret)
         incorrect_usage()  # should not throw in container, since typechecks add a lot of overhead on import
+
+
+def test_container_app_getattr():
+    assert not hasattr(container_app, "_ipython_display_")
+    assert not hasattr(container_app, "__wrapped__")
+    with pytest.raises(DeprecationError):
+        container_app.my_d
+
+
+def test_local_app_getattr():
+    app = _LocalApp(None, "ap-123", "https://modal.com/apps/ap-123")
+    assert not hasattr(app, "_ipython_display_")
+    assert not hasattr(app, "__wrapped__")
+    with pytest.raises(DeprecationError):
+        app.my_d
@@ -27,19 +27,35 @@ from modal_proto import api_pb2
 from .helpers import deploy_stub_externally
 from .supports.skip import skip_windows_unix_socket
 
-EXTRA_TOLERANCE_DELAY = 2.0 if sys.platform == "linux" else 5.0
 FUNCTION_CALL_ID = "fc-123"
 SLEEP_DELAY = 0.1
 
 
-def _get_inputs(args: Tuple[Tuple, Dict] = ((42,), {}), n: int = 1) -> List[api_pb2.FunctionGetInputsResponse]:
-    input_pb = api_pb2.FunctionInput(args=serialize(args), data_format=api_pb2.DATA_FORMAT_PICKLE)
+@pytest.fixture
+def extra_tolerance_delay() -> float:
+    # Upper bound slack for timing assertions. Non-Linux runners and shared CI machines are noisier.
+    delay = 2.0 if sys.platform == "linux" else 5.0
+    if os.environ.get("CI"):
+        delay *= 1.5
+    return delay
+
+
+# Most tests use the same input, so serialize it once rather than for every container run
+_DEFAULT_INPUT_PB = api_pb2.FunctionInput(args=serialize(((42,), {})), data_format=api_pb2.DATA_FORMAT_PICKLE)
+_KILL_SWITCH_ITEM = api_pb2.FunctionGetInputsItem(kill_switch=True)
+
+
+def _get_inputs(args: Optional[Tuple[Tuple, Dict]] = None, n: int = 1) -> List[api_pb2.FunctionGetInputsResponse]:
+    if args is None:
+        input_pb = _DEFAULT_INPUT_PB
+    else:
+        input_pb = api_pb2.FunctionInput(args=serialize(args), data_format=api_pb2.DATA_FORMAT_PICKLE)
     inputs = [
         *(
             api_pb2.FunctionGetInputsItem(input_id=f"in-xyz{i}", function_call_id="fc-123", input=input_pb)
             for i in range(n)
         ),
-        api_pb2.FunctionGetInputsItem(kill_switch=True),
+        _KILL_SWITCH_ITEM,
     ]
     return [api_pb2.FunctionGetInputsResponse(inputs=[x]) for x in inputs]
 
@@ -194,10 +210,10 @@ def _unwrap_asgi(ret: ContainerResult):
 
 
 @skip_windows_unix_socket
-def test_success(unix_servicer, event_loop):
-    t0 = time.time()
+def test_success(unix_servicer, event_loop, extra_tolerance_delay):
+    t0 = time.perf_counter()
     ret = _run_container(unix_servicer, "modal_test_support.functions", "square")
-    assert 0 <= time.time() - t0 < EXTRA_TOLERANCE_DELAY
+    assert 0 <= time.perf_counter() - t0 < extra_tolerance_delay
     assert _unwrap_scalar(ret) == 42**2
 
 
@@ -229,10 +245,10 @@ def test_generator_failure(unix_servicer, event_loop):
 
 
 @skip_windows_unix_socket
-def test_async(unix_servicer):
-    t0 = time.time()
+def test_async(unix_servicer, extra_tolerance_delay):
+    t0 = time.perf_counter()
     ret = _run_container(unix_servicer, "modal_test_support.functions", "square_async")
-    assert SLEEP_DELAY <= time.time() - t0 < SLEEP_DELAY + EXTRA_TOLERANCE_DELAY
+    assert SLEEP_DELAY <= time.perf_counter() - t0 < SLEEP_DELAY + extra_tolerance_delay
     assert _unwrap_scalar(ret) == 42**2
 
 
@@ -255,11 +271,11 @@ def test_keyboardinterrupt(unix_servicer):
 
 
 @skip_windows_unix_socket
-def test_rate_limited(unix_servicer, event_loop):
-    t0 = time.time()
+def test_rate_limited(unix_servicer, event_loop, extra_tolerance_delay):
+    t0 = time.perf_counter()
     unix_servicer.rate_limit_sleep_duration = 0.25
     ret = _run_container(unix_servicer, "modal_test_support.functions", "square")
-    assert 0.25 <= time.time() - t0 < 0.25 + EXTRA_TOLERANCE_DELAY
+    assert 0.25 <= time.perf_counter() - t0 < 0.25 + extra_tolerance_delay
     assert _unwrap_scalar(ret) == 42**2
 
 
@@ -670,11 +686,11 @@ def _unwrap_concurrent_input_outputs(n_inputs: int, n_parallel: int, ret: Contai
 
 
 @skip_windows_unix_socket
-def test_concurrent_inputs_sync_function(unix_servicer):
+def test_concurrent_inputs_sync_function(unix_servicer, extra_tolerance_delay):
     n_inputs = 18
     n_parallel = 6
 
-    t0 = time.time()
+    t0 = time.perf_counter()
     ret = _run_container(
         unix_servicer,
         "modal_test_support.functions",
@@ -684,7 +700,7 @@ def test_concurrent_inputs_sync_function(unix_servicer):
     )
 
     expected_execution = n_inputs / n_parallel * SLEEP_TIME
-    assert expected_execution <= time.time() - t0 < expected_execution + EXTRA_TOLERANCE_DELAY
+    assert expected_execution <= time.perf_counter() - t0 < expected_execution + extra_tolerance_delay
     outputs = _unwrap_concurrent_input_outputs(n_inputs, n_parallel, ret)
     for i, (squared, input_id, function_call_id) in enumerate(outputs):
         assert squared == 42**2
@@ -693,11 +709,11 @@ def test_concurrent_inputs_sync_function(unix_servicer):
 
 
 @skip_windows_unix_socket
-def test_concurrent_inputs_async_function(unix_servicer, event_loop):
+def test_concurrent_inputs_async_function(unix_servicer, event_loop, extra_tolerance_delay):
     n_inputs = 18
     n_parallel = 6
 
-    t0 = time.time()
+    t0 = time.perf_counter()
     ret = _run_container(
         unix_servicer,
         "modal_test_support.functions",
@@ -707,7 +723,7 @@ def test_concurrent_inputs_async_function(unix_servicer, event_loop):
     )
 
     expected_execution = n_inputs / n_parallel * SLEEP_TIME
-    assert expected_execution <= time.time() - t0 < expected_execution + EXTRA_TOLERANCE_DELAY
+    assert expected_execution <= time.perf_counter() - t0 < expected_execution + extra_tolerance_delay
     outputs = _unwrap_concurrent_input_outputs(n_inputs, n_parallel, ret)
     for i, (squared, input_id, function_call_id) in enumerate(outputs):
         assert squared == 42**2
@@ -741,7 +757,7 @@ def test_derived_cls(unix_servicer, event_loop):
 @skip_windows_unix_socket
 def test_call_function_that_calls_function(unix_servicer, event_loop):
     deploy_stub_externally(unix_servicer, "modal_test_support.functions", "stub")
-    ret = _run_container(unix_servicer, "modal_test_support.functions", "cube", inputs=_get_inputs(((42,), {})))
+    ret = _run_container(unix_servicer, "modal_test_support.functions", "cube", inputs=_get_inputs())
     assert _unwrap_scalar(ret) == 42**3
 
 
@@ -766,6 +782,16 @@ def test_checkpoint_and_restore_success(unix_servicer, event_loop):
     assert _unwrap_scalar(ret) == 42**2
 
 
+@skip_windows_unix_socket
+def test_checkpoint_closes_blob_http_client(unix_servicer, event_loop):
+    """Pooled blob connections must not be captured in the checkpoint."""
+    close_http_client = mock.AsyncMock()
+    with mock.patch("modal._container_entrypoint.close_http_client", close_http_client):
+        ret = _run_container(unix_servicer, "modal_test_support.functions", "square", is_checkpointing_function=True)
+    close_http_client.assert_awaited_once()
+    assert _unwrap_scalar(ret) == 42**2
+
+
 @skip_windows_unix_socket
 def test_volume_commit_on_exit(unix_servicer, event_loop):
     volume_mounts = [
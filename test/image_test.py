@@ -26,13 +26,14 @@ def get_image_layers(image_id: str, servicer) -> List[api_pb2.Image]:
     and return a list of image layers from top to bottom."""
 
     result = []
+    images = servicer.images
 
     while True:
-        if image_id not in servicer.images:
+        image = images.get(image_id)
+        if image is None:
             break
 
-        image = servicer.images[image_id]
-        result.append(servicer.images[image_id])
+        result.append(image)
 
         if not image.base_images:
             break
@@ -50,6 +50,21 @@ async def test_get_files(servicer, client, tmpdir):
     }
 
 
+@pytest.mark.asyncio
+async def test_duplicate_files_uploaded_once(servicer, client, tmpdir):
+    large_content = b"a" * (LARGE_FILE_LIMIT + 1)
+    for i in range(5):
+        tmpdir.join(f"large_{i}.py").write(large_content)
+        tmpdir.join(f"small_{i}.py").write("# same")
+
+    m = Mount.from_local_dir(Path(tmpdir), remote_path="/")
+    await m._deploy.aio("my-mount", client=client)
+
+    assert len(servicer.files_name2sha) == 10
+    assert servicer.n_mount_files == 2
+    assert len(servicer.blobs) == 1
+
+
 def test_create_mount(servicer, client):
     local_dir, cur_filename = os.path.split(__file__)
 
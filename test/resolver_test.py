@@ -6,6 +6,7 @@ from typing import Optional
 
 from modal._output import OutputManager
 from modal._resolver import Resolver
+from modal.app import _LocalApp
 from modal.object import _Object
 
 
@@ -54,3 +55,32 @@ async def test_multi_resolve_concurrent_loads_once():
     await asyncio.gather(resolver.load(obj), resolver.load(obj))
     assert 0.08 < time.monotonic() - t0 < 0.17
     assert load_count == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_load_cancels_other_loads():
+    output_manager = OutputManager(None, show_progress=False)
+    app = _LocalApp(None, "ap-123", "https://modal.com/apps/ap-123")
+
+    slow_load_finished = False
+
+    class _DumbObject(_Object, type_prefix="zz"):
+        pass
+
+    async def _load_failing(provider: _DumbObject, resolver: Resolver, existing_object_id: Optional[str]):
+        raise RuntimeError("image build failed")
+
+    async def _load_slow(provider: _DumbObject, resolver: Resolver, existing_object_id: Optional[str]):
+        nonlocal slow_load_finished
+        await asyncio.sleep(0.2)
+        slow_load_finished = True
+
+    indexed_objects = {
+        "failing": _DumbObject._from_loader(_load_failing, "FailingObject()"),
+        "slow": _DumbObject._from_loader(_load_slow, "SlowObject()"),
+    }
+    with pytest.raises(RuntimeError, match="image build failed"):
+        await app._create_all_objects(indexed_objects, 0, "", output_mgr=output_manager)
+
+    await asyncio.sleep(0.3)
+    assert not slow_load_finished